@@ -0,0 +1,98 @@
+"""bsmのカーネルのベンチマーク
+
+scipy.stats.normを利用した従来の実装と、ndtrを利用した実装、
+numbaでコンパイルしたカーネル（インストールされている場合）を比較する。
+
+パッケージをインストールした環境（`poetry install --extras numba` など）で
+リポジトリのルートから実行する。
+
+    poetry run python benchmarks/bench_bsm.py
+"""
+import timeit
+
+import numpy as np
+from scipy.optimize import fsolve
+from scipy.stats import norm
+
+from jquants_derivatives import bsm
+
+N_STRIKES = 2_000
+N_SCALAR = 200
+
+
+def reference_price_put(s, k, t, r, sigma):
+    d1 = ((np.log(s / k)) + (r + sigma**2 * 0.5 * t)) / (sigma * np.sqrt(t))
+    d2 = d1 - sigma * np.sqrt(t)
+    return k * np.exp(-r * t) * norm.cdf(-d2) - s * norm.cdf(-d1)
+
+
+def reference_gamma(s, k, t, r, sigma):
+    d1 = ((np.log(s / k)) + (r + sigma**2 * 0.5 * t)) / (sigma * np.sqrt(t))
+    return norm.pdf(d1) / (s * sigma * np.sqrt(t))
+
+
+def reference_implied_volatility_put(s, k, t, r, price):
+    def find_volatility(sigma):
+        return reference_price_put(s, k, t, r, sigma) - price
+
+    sigma0 = np.sqrt(abs(np.log(s / k) + r * t) * 2 / t)
+    return fsolve(find_volatility, sigma0)[0]
+
+
+def make_chain():
+    rng = np.random.default_rng(0)
+    s = np.full(N_STRIKES, 27_500.0)
+    k = np.linspace(20_000.0, 27_500.0, N_STRIKES)
+    t = np.full(N_STRIKES, 0.05)
+    r = np.full(N_STRIKES, 0.0005)
+    sigma = rng.uniform(0.15, 0.45, N_STRIKES)
+    price = reference_price_put(s, k, t, r, sigma)
+    return s, k, t, r, sigma, price
+
+
+def bench(label, func, number):
+    elapsed = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"{label:<40}{elapsed * 1e3:>10.3f} ms")
+
+
+def run(backend: str, s, k, t, r, sigma, price):
+    if backend == "reference":
+        price_put, gamma, iv_put = (
+            reference_price_put,
+            reference_gamma,
+            reference_implied_volatility_put,
+        )
+    else:
+        bsm.USE_NUMBA = backend == "numba"
+        price_put, gamma, iv_put = (
+            bsm.price_put,
+            bsm.gamma,
+            bsm.implied_volatility_put,
+        )
+    bench(f"[{backend}] price_put (array)", lambda: price_put(s, k, t, r, sigma), 100)
+    bench(f"[{backend}] gamma (array)", lambda: gamma(s, k, t, r, sigma), 100)
+    bench(
+        f"[{backend}] price_put (scalar x{N_SCALAR})",
+        lambda: [price_put(s[i], k[i], t[i], r[i], sigma[i]) for i in range(N_SCALAR)],
+        5,
+    )
+    bench(
+        f"[{backend}] implied_volatility_put (x{N_SCALAR})",
+        lambda: [iv_put(s[i], k[i], t[i], r[i], price[i]) for i in range(N_SCALAR)],
+        1,
+    )
+
+
+def main():
+    chain = make_chain()
+    use_numba = bsm.USE_NUMBA
+    backends = ["reference", "ndtr"] + (["numba"] if bsm._bsm_numba else [])
+    try:
+        for backend in backends:
+            run(backend, *chain)
+    finally:
+        bsm.USE_NUMBA = use_numba
+
+
+if __name__ == "__main__":
+    main()
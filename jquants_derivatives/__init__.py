@@ -1,5 +1,5 @@
-from . import database, models
+from . import database, models, snapshot
 from .client import Client
-from .derivatievs import Option, plot_volatility
+from .derivatievs import Option, load_summary, plot_volatility, update_summary
 
 database.main()
@@ -1,5 +1,73 @@
-from . import database
+import argparse
+import logging
+from typing import Optional, Sequence
+
+from . import database, maintenance
 
 
 def update_sq() -> None:
     database.update_sq()
+
+
+def _print_counts(counts: dict[str, int], label: str) -> None:
+    for table, count in counts.items():
+        if count:
+            print(f"{table}: {label} {count} rows")
+    print(f"total: {label} {sum(counts.values())} rows")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="jquants_derivatives", description="Maintain the jquantsapi.db cache"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("update-sq", help="download the latest sq.csv")
+
+    stats = subparsers.add_parser("stats", help="report rows, date coverage and bytes")
+    stats.add_argument("--table", action="append", dest="tables")
+
+    dedupe = subparsers.add_parser("dedupe", help="remove duplicated rows")
+    dedupe.add_argument("--table", action="append", dest="tables")
+
+    prune = subparsers.add_parser("prune", help="remove rows in a date range")
+    prune.add_argument("--start", required=True)
+    prune.add_argument("--end", required=True)
+    prune.add_argument("--table", action="append", dest="tables")
+
+    reindex = subparsers.add_parser("reindex", help="create Date indexes and REINDEX")
+    reindex.add_argument("--table", action="append", dest="tables")
+
+    subparsers.add_parser("vacuum", help="run VACUUM and ANALYZE")
+
+    warm = subparsers.add_parser("warm", help="load local CSV files into the cache")
+    warm.add_argument("directory")
+    warm.add_argument("--start", required=True)
+    warm.add_argument("--end", required=True)
+    warm.add_argument(
+        "--table",
+        default="OPTION_INDEX_OPTION",
+        choices=sorted(maintenance.WARM_MODELS),
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "update-sq":
+        update_sq()
+    elif args.command == "stats":
+        print(maintenance.stats(args.tables).to_string(index=False))
+    elif args.command == "dedupe":
+        _print_counts(maintenance.remove_duplicates(args.tables), "removed")
+    elif args.command == "prune":
+        _print_counts(maintenance.prune(args.start, args.end, args.tables), "removed")
+    elif args.command == "reindex":
+        maintenance.rebuild_indexes(args.tables)
+    elif args.command == "vacuum":
+        maintenance.vacuum()
+    elif args.command == "warm":
+        dates = maintenance.warm(args.directory, args.start, args.end, args.table)
+        print(f"stored {len(dates)} dates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""numbaでコンパイルしたBSMのカーネル
+
+numbaがインストールされている場合に `bsm` から自動的に利用される。
+"""
+import math
+
+from numba import njit, vectorize
+
+from .bsm import MAX_ITERATIONS, SIGMA_MAX, SIGMA_MIN, TOLERANCE
+
+SQRT_2 = math.sqrt(2.0)
+SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+_SIGNATURE = ["float64(float64, float64, float64, float64, float64)"]
+_SIGNATURE_DIV = ["float64(float64, float64, float64, float64, float64, int64)"]
+
+
+@njit(cache=True, error_model="numpy")
+def _norm_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) / SQRT_2PI
+
+
+@njit(cache=True, error_model="numpy")
+def _norm_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / SQRT_2)
+
+
+@njit(cache=True, error_model="numpy")
+def _d1(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    return ((math.log(s / k)) + (r + sigma**2 * 0.5 * t)) / (sigma * math.sqrt(t))
+
+
+@njit(cache=True, error_model="numpy")
+def _price_call(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    d1 = _d1(s, k, t, r, sigma)
+    d2 = d1 - sigma * math.sqrt(t)
+    return s * _norm_cdf(d1) - k * math.exp(-r * t) * _norm_cdf(d2)
+
+
+@njit(cache=True, error_model="numpy")
+def _price_put(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    d1 = _d1(s, k, t, r, sigma)
+    d2 = d1 - sigma * math.sqrt(t)
+    return k * math.exp(-r * t) * _norm_cdf(-d2) - s * _norm_cdf(-d1)
+
+
+@njit(cache=True, error_model="numpy")
+def _vega(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    return s * _norm_pdf(_d1(s, k, t, r, sigma)) * math.sqrt(t)
+
+
+@njit(cache=True, error_model="numpy")
+def _theta_base(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    return -s * _norm_pdf(_d1(s, k, t, r, sigma)) * sigma / (2 * math.sqrt(t))
+
+
+@vectorize(_SIGNATURE, cache=True)
+def vega(s, k, t, r, sigma):
+    return _vega(s, k, t, r, sigma)
+
+
+@vectorize(_SIGNATURE, cache=True)
+def delta_call(s, k, t, r, sigma):
+    return _norm_cdf(_d1(s, k, t, r, sigma))
+
+
+@vectorize(_SIGNATURE, cache=True)
+def delta_put(s, k, t, r, sigma):
+    return _norm_cdf(_d1(s, k, t, r, sigma)) - 1
+
+
+@vectorize(_SIGNATURE, cache=True)
+def gamma(s, k, t, r, sigma):
+    return _norm_pdf(_d1(s, k, t, r, sigma)) / (s * sigma * math.sqrt(t))
+
+
+@vectorize(_SIGNATURE, cache=True)
+def theta_call(s, k, t, r, sigma):
+    d2 = _d1(s, k, t, r, sigma) - sigma * math.sqrt(t)
+    return _theta_base(s, k, t, r, sigma) - r * k * math.exp(-r * t) * _norm_cdf(d2)
+
+
+@vectorize(_SIGNATURE, cache=True)
+def theta_put(s, k, t, r, sigma):
+    d2 = _d1(s, k, t, r, sigma) - sigma * math.sqrt(t)
+    return _theta_base(s, k, t, r, sigma) + r * k * math.exp(-r * t) * _norm_cdf(-d2)
+
+
+@vectorize(_SIGNATURE, cache=True)
+def price_call(s, k, t, r, sigma):
+    return _price_call(s, k, t, r, sigma)
+
+
+@vectorize(_SIGNATURE, cache=True)
+def price_put(s, k, t, r, sigma):
+    return _price_put(s, k, t, r, sigma)
+
+
+@vectorize(_SIGNATURE_DIV, cache=True)
+def implied_volatility(s, k, t, r, price, div):
+    """範囲を限定したニュートン法（収束しない場合は二分法）"""
+    if div == 1:
+        low = _price_put(s, k, t, r, SIGMA_MIN) - price
+        high = _price_put(s, k, t, r, SIGMA_MAX) - price
+    else:
+        low = _price_call(s, k, t, r, SIGMA_MIN) - price
+        high = _price_call(s, k, t, r, SIGMA_MAX) - price
+    # 入力がnanの場合も解なしとする
+    if not (low <= 0 <= high):
+        return math.nan
+    lower, upper = SIGMA_MIN, SIGMA_MAX
+    sigma = math.sqrt(abs(math.log(s / k) + r * t) * 2 / t)
+    if not lower < sigma < upper:
+        sigma = 0.5 * (lower + upper)
+    for _ in range(MAX_ITERATIONS):
+        if div == 1:
+            diff = _price_put(s, k, t, r, sigma) - price
+        else:
+            diff = _price_call(s, k, t, r, sigma) - price
+        if abs(diff) < TOLERANCE:
+            return sigma
+        if diff > 0:
+            upper = sigma
+        else:
+            lower = sigma
+        v = _vega(s, k, t, r, sigma)
+        step = sigma - diff / v if v > 0 else math.nan
+        if lower < step < upper:
+            sigma = step
+        else:
+            sigma = 0.5 * (lower + upper)
+        if upper - lower < TOLERANCE:
+            return sigma
+    return sigma
@@ -1,6 +1,31 @@
 import numpy as np
-from scipy.optimize import fsolve
-from scipy.stats import norm
+from scipy.special import ndtr
+
+# インプライド・ボラティリティの探索範囲と収束条件（_bsm_numbaと共通）
+SIGMA_MIN = 1e-6
+SIGMA_MAX = 10.0
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-10
+
+try:
+    from . import _bsm_numba
+except ImportError:
+    _bsm_numba = None
+
+# numbaがインストールされている場合はコンパイル済みのカーネルを利用する
+USE_NUMBA = _bsm_numba is not None
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _norm_pdf(x: float) -> float:
+    """標準正規分布の確率密度関数（scipy.stats.norm.pdfと同値）"""
+    return np.exp(-0.5 * np.square(x)) / _SQRT_2PI
+
+
+def _norm_cdf(x: float) -> float:
+    """標準正規分布の累積分布関数（scipy.stats.norm.cdfと同値）"""
+    return ndtr(x)
 
 
 def _d1(s: float, k: float, t: float, r: float, sigma: float) -> float:
@@ -12,18 +37,24 @@ def _d2(d1: float, sigma: float, t: float) -> float:
 
 
 def vega(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.vega(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
-    return s * norm.pdf(d1) * np.sqrt(t)
+    return s * _norm_pdf(d1) * np.sqrt(t)
 
 
 def delta_call(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.delta_call(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
-    return norm.cdf(d1)
+    return _norm_cdf(d1)
 
 
 def delta_put(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.delta_put(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
-    return norm.cdf(d1) - 1
+    return _norm_cdf(d1) - 1
 
 
 def delta(s: float, k: float, t: float, r: float, sigma: float, div: int) -> float:
@@ -31,23 +62,29 @@ def delta(s: float, k: float, t: float, r: float, sigma: float, div: int) -> flo
 
 
 def gamma(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.gamma(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
-    return norm.pdf(d1) / (s * sigma * np.sqrt(t))
+    return _norm_pdf(d1) / (s * sigma * np.sqrt(t))
 
 
 def theta_call(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.theta_call(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
     d2 = _d2(d1, sigma, t)
-    return (-s * norm.pdf(d1) * sigma / (2 * np.sqrt(t))) - (
-        r * k * np.exp(-r * t) * norm.cdf(d2)
+    return (-s * _norm_pdf(d1) * sigma / (2 * np.sqrt(t))) - (
+        r * k * np.exp(-r * t) * _norm_cdf(d2)
     )
 
 
 def theta_put(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.theta_put(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
     d2 = _d2(d1, sigma, t)
-    return (-s * norm.pdf(d1) * sigma / (2 * np.sqrt(t))) + (
-        r * k * np.exp(-r * t) * norm.cdf(-d2)
+    return (-s * _norm_pdf(d1) * sigma / (2 * np.sqrt(t))) + (
+        r * k * np.exp(-r * t) * _norm_cdf(-d2)
     )
 
 
@@ -56,25 +93,71 @@ def theta(s: float, k: float, t: float, r: float, sigma: float, div: int) -> flo
 
 
 def price_call(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.price_call(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
     d2 = _d2(d1, sigma, t)
-    return s * norm.cdf(d1) - k * np.exp(-r * t) * norm.cdf(d2)
+    return s * _norm_cdf(d1) - k * np.exp(-r * t) * _norm_cdf(d2)
 
 
 def price_put(s: float, k: float, t: float, r: float, sigma: float) -> float:
+    if USE_NUMBA:
+        return _bsm_numba.price_put(s, k, t, r, sigma)
     d1 = _d1(s, k, t, r, sigma)
     d2 = _d2(d1, sigma, t)
-    return k * np.exp(-r * t) * norm.cdf(-d2) - s * norm.cdf(-d1)
+    return k * np.exp(-r * t) * _norm_cdf(-d2) - s * _norm_cdf(-d1)
 
 
 def implied_volatility(
     s: float, k: float, t: float, r: float, price: float, div: int
 ) -> float:
-    def find_volatility(sigma):
-        return {1: price_put, 2: price_call}[div](s, k, t, r, sigma) - price
+    """インプライド・ボラティリティ
+
+    配列を渡した場合は配列を返す。探索範囲内に解がない場合はnanを返す。
+    """
+    args = [np.asarray(x, dtype=float) for x in (s, k, t, r, price)]
+    div = np.asarray(div).astype(np.int64)
+    if USE_NUMBA:
+        result = _bsm_numba.implied_volatility(*args, div)
+    else:
+        result = _implied_volatility(*args, div)
+    return np.asarray(result)[()]
 
-    sigma0 = np.sqrt(abs(np.log(s / k) + r * t) * 2 / t)
-    return fsolve(find_volatility, sigma0)[0]
+
+def _implied_volatility_scalar(
+    s: float, k: float, t: float, r: float, price: float, div: int
+) -> float:
+    """範囲を限定したニュートン法（収束しない場合は二分法）"""
+    price_func = price_put if div == 1 else price_call
+    low = price_func(s, k, t, r, SIGMA_MIN) - price
+    high = price_func(s, k, t, r, SIGMA_MAX) - price
+    # 入力がnanの場合も解なしとする
+    if not (low <= 0 <= high):
+        return np.nan
+    lower, upper = SIGMA_MIN, SIGMA_MAX
+    sigma = np.sqrt(abs(np.log(s / k) + r * t) * 2 / t)
+    if not lower < sigma < upper:
+        sigma = 0.5 * (lower + upper)
+    for _ in range(MAX_ITERATIONS):
+        diff = price_func(s, k, t, r, sigma) - price
+        if abs(diff) < TOLERANCE:
+            return sigma
+        if diff > 0:
+            upper = sigma
+        else:
+            lower = sigma
+        v = vega(s, k, t, r, sigma)
+        step = sigma - diff / v if v > 0 else np.nan
+        if lower < step < upper:
+            sigma = step
+        else:
+            sigma = 0.5 * (lower + upper)
+        if upper - lower < TOLERANCE:
+            return sigma
+    return sigma
+
+
+_implied_volatility = np.vectorize(_implied_volatility_scalar, otypes=[float])
 
 
 def implied_volatility_call(
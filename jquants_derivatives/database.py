@@ -1,4 +1,5 @@
 import sqlite3
+import warnings
 from pathlib import Path
 from urllib import request
 
@@ -39,6 +40,23 @@ def load(table: str, date_yyyymmdd: str) -> pd.DataFrame:
         return pd.read_sql(sql, con)
 
 
+def load_all(table: str) -> pd.DataFrame:
+    with sqlite3.connect(db) as con:
+        sql = f"SELECT * FROM {table} ORDER BY Date"
+        return pd.read_sql(sql, con)
+
+
+def load_range(table: str, start_yyyymmdd: str, end_yyyymmdd: str) -> pd.DataFrame:
+    start = pd.Timestamp(start_yyyymmdd)
+    end = pd.Timestamp(end_yyyymmdd)
+    with sqlite3.connect(db) as con:
+        sql = (
+            f'SELECT * FROM {table} WHERE Date BETWEEN "{start}" AND "{end}" '
+            "ORDER BY Date"
+        )
+        return pd.read_sql(sql, con)
+
+
 def update_sq() -> None:
     directory.mkdir(exist_ok=True)
     data = request.urlopen(
@@ -51,7 +69,11 @@ def main() -> None:
     if not db.exists():
         directory.mkdir(exist_ok=True)
         create_tables()
-    update_sq()
+    try:
+        update_sq()
+    except OSError as e:
+        # オフラインでもキャッシュを利用できるようにする
+        warnings.warn(f"Failed to update {sq_csv}: {e}")
 
 
 if __name__ == "__main__":
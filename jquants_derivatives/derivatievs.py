@@ -1,27 +1,32 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-from jquants_derivatives.models import IndexOptionAppend
+from jquants_derivatives.models import IndexOptionAppend, IndexOptionSummary
 
-from . import bsm, database
+from . import bsm, client, database
 
 YEAR_TO_SECONDS = 31_536_000  # 365日を秒に換算
+MIN_PRICE = 1  # 扱うプレミアムの最小値（既定値）
+SUMMARY_DELTA = 0.25  # リスクリバーサル・バタフライのデルタ
+SUMMARY_TABLE_NAME = "OPTION_INDEX_OPTION_SUMMARY"
+ITM_OTM_KEYS = ["ContractMonth", "PutCallDivision", "StrikePrice"]
 
 
 @dataclass
 class Option:
     df: pd.DataFrame
     contracts: int = 2  # 扱う限月の数
-    min_price: float = 1  # 扱うプレミアムの最小値
+    min_price: float = MIN_PRICE  # 扱うプレミアムの最小値
     sq: bool = True
     greeks: bool = True
     use_cache: bool = True
     cache_table_name: str = "OPTION_INDEX_OPTION_PROCESSED"
+    summary_table_name: str = SUMMARY_TABLE_NAME
 
     def __post_init__(self):
         self.raw_df = self.df.copy()
@@ -76,6 +81,7 @@ class Option:
                 data = pd.DataFrame()
             if len(data) > 0:
                 self.df = data
+                self.unmatched_strikes = self.get_unmatched_strikes(self.df)
             else:
                 self.df = self.process_data()
                 database.store(self.df, self.cache_table_name)
@@ -84,6 +90,7 @@ class Option:
             database.store(self.df, self.cache_table_name)
         
         self.contracts_dfs = self.get_filtered_data(self.df)
+        self.store_summary()
 
     def process_data(self) -> pd.DataFrame:
         groupby_contract_month = self.raw_df.groupby("ContractMonth")
@@ -137,8 +144,8 @@ class Option:
                 df.loc[
                     ix["contract"][contract], "FinalSettlementPrice"
                 ] = self.sq_price[contract]
-        # ITMのボラティリティをOTMにそろえる
-        self.align_itm_from_otm(df, "ImpliedVolatility")
+        # ITMのボラティリティをOTMにそろえる（対応するOTMがないストライクを記録）
+        self.unmatched_strikes = self.align_itm_from_otm(df, "ImpliedVolatility")
         # Greeks
         if self.greeks:
             apply_greeks(df, self.contract_month)
@@ -156,16 +163,91 @@ class Option:
         ]
         return dict(sq_ser.reindex(self.contract_month))
 
-    def align_itm_from_otm(self, df: pd.DataFrame, columns_name: str) -> None:
-        """ITMのデータをOTMにそろえる"""
-        ix = _get_ix(df, self.contract_month)
-        for contract in self.contract_month:
-            df.loc[ix["itm_put"][contract], columns_name] = df.loc[
-                ix["otm_call"][contract], columns_name
-            ].values
-            df.loc[ix["itm_call"][contract], columns_name] = df.loc[
-                ix["otm_put"][contract], columns_name
-            ].values
+    def align_itm_from_otm(self, df: pd.DataFrame, columns_name: str) -> pd.DataFrame:
+        """ITMのデータを同じ限月・ストライクのOTMにそろえる
+
+        対応するOTMがないITMは元の値のまま残し、その限月・ストライクを返す。
+        """
+        is_itm, merged, matched = self._match_itm_to_otm(df, columns_name)
+        df.loc[is_itm, columns_name] = np.where(
+            matched,
+            merged.loc[:, columns_name].to_numpy(),
+            df.loc[is_itm, columns_name].to_numpy(),
+        )
+        return merged.loc[~matched, ITM_OTM_KEYS].reset_index(drop=True)
+
+    def get_unmatched_strikes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """対応するOTMがないITMの限月・ストライク"""
+        _, merged, matched = self._match_itm_to_otm(df, "ImpliedVolatility")
+        return merged.loc[~matched, ITM_OTM_KEYS].reset_index(drop=True)
+
+    def _match_itm_to_otm(
+        self, df: pd.DataFrame, columns_name: str
+    ) -> tuple[pd.Series, pd.DataFrame, np.ndarray]:
+        """ITMの行と同じ限月・ストライクの反対側のOTMの行を結合する"""
+        otm = df.loc[df.loc[:, "Otm"] == 1, ITM_OTM_KEYS + [columns_name]]
+        # プットのITMはコールのOTM、コールのITMはプットのOTMに対応する
+        otm = otm.assign(
+            PutCallDivision=3 - otm.loc[:, "PutCallDivision"]
+        ).drop_duplicates(ITM_OTM_KEYS)
+        is_itm = (df.loc[:, "Otm"] == 0) & df.loc[:, "ContractMonth"].isin(
+            self.contract_month
+        )
+        merged = df.loc[is_itm, ITM_OTM_KEYS].merge(
+            otm, on=ITM_OTM_KEYS, how="left", indicator=True
+        )
+        matched = (merged.loc[:, "_merge"] == "both").to_numpy()
+        return is_itm, merged, matched
+
+    def get_summary(self, contract_month: Optional[list] = None) -> pd.DataFrame:
+        """限月ごとのATMのIV、25デルタのリスクリバーサル・バタフライ
+
+        `contract_month` を渡した場合はその限月だけを計算する。
+        保管される要約が `min_price` によって変わらないように、
+        ストライクは常に既定値 `MIN_PRICE` で抽出する。
+        """
+        if contract_month is None:
+            contract_month = self.contract_month
+        if self.min_price == MIN_PRICE:
+            contracts_dfs = self.contracts_dfs
+        else:
+            groupby_contract = self.df.groupby("ContractMonth")
+            contracts_dfs = {
+                contract: self.filter_data(
+                    groupby_contract.get_group(contract), MIN_PRICE
+                )
+                for contract in contract_month
+            }
+        base_volatility = dict(
+            self.df.groupby("ContractMonth")["BaseVolatility"].first()
+        )
+        summary = []
+        for contract in contract_month:
+            s = self.underlying_price[contract]
+            atm_iv, risk_reversal, butterfly = get_smile_metrics(
+                contracts_dfs[contract], s
+            )
+            summary.append(
+                {
+                    "Date": self.date,
+                    "ContractMonth": contract,
+                    "UnderlyingPrice": s,
+                    "BaseVolatility": base_volatility[contract],
+                    "TimeToMaturity": self.time_to_maturity[contract],
+                    "AtmImpliedVolatility": atm_iv,
+                    "RiskReversal25": risk_reversal,
+                    "Butterfly25": butterfly,
+                }
+            )
+        return pd.DataFrame(summary, columns=list(IndexOptionSummary.__annotations__))
+
+    def store_summary(self) -> None:
+        """保管されていない限月の要約をデータベースに追加"""
+        stored = _load_summary(self.summary_table_name, str(self.date))
+        stored_contracts = set(stored.get("ContractMonth", []))
+        missing = [x for x in self.contract_month if x not in stored_contracts]
+        if missing:
+            database.store(self.get_summary(missing), self.summary_table_name)
 
     def get_filtered_data(self, df: pd.DataFrame) -> dict[str, pd.DataFrame]:
         groupby_contract = df.groupby("ContractMonth")
@@ -175,8 +257,15 @@ class Option:
         }
         return contracts_dfs
 
-    def filter_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """扱うストライクだけを抽出する"""
+    def filter_data(
+        self, df: pd.DataFrame, min_price: Optional[float] = None
+    ) -> pd.DataFrame:
+        """扱うストライクだけを抽出する
+
+        `min_price` を省略した場合はインスタンスの `min_price` を使う。
+        """
+        if min_price is None:
+            min_price = self.min_price
         s = df.loc[:, "UnderlyingPrice"].iloc[0]  # 原資産価格
         # 取引高が0のストライクを除外
         volume_exists = df.loc[df.loc[:, "Volume"] != 0, :].sort_values("StrikePrice")
@@ -192,11 +281,11 @@ class Option:
             & (volume_exists.loc[:, "StrikePrice"] > s)
         ]
         # 扱うストライクをプレミアムの最小値までとする
-        min_price_put = max(put.loc[:, "WholeDayClose"].min(), self.min_price)
+        min_price_put = max(put.loc[:, "WholeDayClose"].min(), min_price)
         price_min_strike_put = put.loc[
             put.loc[:, "WholeDayClose"] == min_price_put, "StrikePrice"
         ].max()
-        min_price_call = max(call_.loc[:, "WholeDayClose"].min(), self.min_price)
+        min_price_call = max(call_.loc[:, "WholeDayClose"].min(), min_price)
         price_min_strike_call = call_.loc[
             call_.loc[:, "WholeDayClose"] == min_price_call, "StrikePrice"
         ].min()
@@ -209,6 +298,90 @@ class Option:
         )
 
 
+def get_smile_metrics(df: pd.DataFrame, s: float) -> tuple[float, float, float]:
+    """ATMのIV、25デルタのリスクリバーサルとバタフライ
+
+    `Option.contracts_dfs` の各限月のDataFrameを渡す。
+    補間できない場合はnanを返す。
+    """
+    atm_iv = _interp(
+        s,
+        df.loc[:, "StrikePrice"].to_numpy(dtype=float),
+        df.loc[:, "ImpliedVolatility"].to_numpy(dtype=float),
+    )
+    put = df.loc[df.loc[:, "PutCallDivision"] == 1, :]
+    call_ = df.loc[df.loc[:, "PutCallDivision"] == 2, :]
+    iv_put = _interp(
+        -SUMMARY_DELTA,
+        bsm.delta_put(*_bsm_args(put)),
+        put.loc[:, "ImpliedVolatility"].to_numpy(dtype=float),
+    )
+    iv_call = _interp(
+        SUMMARY_DELTA,
+        bsm.delta_call(*_bsm_args(call_)),
+        call_.loc[:, "ImpliedVolatility"].to_numpy(dtype=float),
+    )
+    risk_reversal = iv_call - iv_put
+    butterfly = (iv_call + iv_put) * 0.5 - atm_iv
+    return atm_iv, risk_reversal, butterfly
+
+
+def _interp(x: float, xp: np.ndarray, fp: np.ndarray) -> float:
+    """線形補間（範囲外は外挿せずにnanを返す）"""
+    xp = np.asarray(xp, dtype=float)
+    valid = ~(np.isnan(xp) | np.isnan(fp))
+    xp, fp = xp[valid], fp[valid]
+    if len(xp) == 0 or not xp.min() <= x <= xp.max():
+        return np.nan
+    order = np.argsort(xp)
+    return float(np.interp(x, xp[order], fp[order]))
+
+
+def load_summary(
+    start_yyyymmdd: str,
+    end_yyyymmdd: str,
+    table_name: str = SUMMARY_TABLE_NAME,
+) -> pd.DataFrame:
+    """期間中の要約を時系列で取得"""
+    try:
+        df = database.load_range(table_name, start_yyyymmdd, end_yyyymmdd)
+    except pd.errors.DatabaseError:
+        df = pd.DataFrame(columns=list(IndexOptionSummary.__annotations__))
+    df = df.sort_values(["Date", "ContractMonth"], ignore_index=True)
+    return pd.DataFrame(
+        {
+            col: client.cast_series_dtype(
+                df.loc[:, col], IndexOptionSummary.get_dtype(col)
+            )
+            for col in df.columns
+        }
+    )
+
+
+def update_summary(
+    cli: client.Client,
+    dates: Iterable[str],
+    contracts: int = 2,
+    table_name: str = SUMMARY_TABLE_NAME,
+) -> None:
+    """要約が保管されていない日付だけOptionを作成して要約を保管する"""
+    for date in dates:
+        stored = _load_summary(table_name, date)
+        if len(stored) >= contracts:
+            continue
+        df = cli.get_option_index_option(date)
+        if len(df) == 0:  # 休業日
+            continue
+        Option(df, contracts=contracts, summary_table_name=table_name)
+
+
+def _load_summary(table_name: str, date_yyyymmdd: str) -> pd.DataFrame:
+    try:
+        return database.load(table_name, date_yyyymmdd)
+    except pd.errors.DatabaseError:
+        return pd.DataFrame()
+
+
 def _get_ix(df: pd.DataFrame, contract_month: list) -> dict:
     ix = {}
     ix["contract"] = {
@@ -229,38 +402,6 @@ def _get_ix(df: pd.DataFrame, contract_month: list) -> dict:
         ].index
         for contract in contract_month
     }
-    ix["otm_put"] = {
-        contract: df.loc[
-            (df.loc[:, "ContractMonth"] == contract)
-            & (df.loc[:, "PutCallDivision"] == 1)
-            & (df.loc[:, "Otm"] == 1)
-        ].index
-        for contract in contract_month
-    }
-    ix["otm_call"] = {
-        contract: df.loc[
-            (df.loc[:, "ContractMonth"] == contract)
-            & (df.loc[:, "PutCallDivision"] == 2)
-            & (df.loc[:, "Otm"] == 1)
-        ].index
-        for contract in contract_month
-    }
-    ix["itm_put"] = {
-        contract: df.loc[
-            (df.loc[:, "ContractMonth"] == contract)
-            & (df.loc[:, "PutCallDivision"] == 1)
-            & (df.loc[:, "Otm"] == 0)
-        ].index
-        for contract in contract_month
-    }
-    ix["itm_call"] = {
-        contract: df.loc[
-            (df.loc[:, "ContractMonth"] == contract)
-            & (df.loc[:, "PutCallDivision"] == 2)
-            & (df.loc[:, "Otm"] == 0)
-        ].index
-        for contract in contract_month
-    }
     return ix
 
 
@@ -271,75 +412,32 @@ def apply_greeks(df: pd.DataFrame, contract_month: list) -> None:
 
 def _apply_greeks(df: pd.DataFrame, contract_month: list, contract: str) -> None:
     ix = _get_ix(df, contract_month)
-    # Delta put
-    df.loc[ix["put"][contract], "Delta"] = df.loc[ix["put"][contract], :].apply(
-        lambda x: bsm.delta_put(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
-    )
-    # Delta Call
-    df.loc[ix["call"][contract], "Delta"] = df.loc[ix["call"][contract], :].apply(
-        lambda x: bsm.delta_call(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
-    )
+    put = _bsm_args(df.loc[ix["put"][contract], :])
+    call_ = _bsm_args(df.loc[ix["call"][contract], :])
+    contract_df = _bsm_args(df.loc[ix["contract"][contract], :])
+    # Delta
+    df.loc[ix["put"][contract], "Delta"] = bsm.delta_put(*put)
+    df.loc[ix["call"][contract], "Delta"] = bsm.delta_call(*call_)
     # Gamma
-    df.loc[ix["contract"][contract], "Gamma"] = df.loc[
-        ix["contract"][contract], :
-    ].apply(
-        lambda x: bsm.gamma(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
-    )
+    df.loc[ix["contract"][contract], "Gamma"] = bsm.gamma(*contract_df)
     # Vega
-    df.loc[ix["contract"][contract], "Vega"] = df.loc[
-        ix["contract"][contract], :
-    ].apply(
-        lambda x: bsm.vega(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
-    )
-    # Theta put
-    df.loc[ix["put"][contract], "Theta"] = df.loc[ix["put"][contract], :].apply(
-        lambda x: bsm.theta_put(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
-    )
-    # Theta Call
-    df.loc[ix["call"][contract], "Theta"] = df.loc[ix["call"][contract], :].apply(
-        lambda x: bsm.theta_call(
-            x["UnderlyingPrice"],
-            x["StrikePrice"],
-            x["TimeToMaturity"],
-            x["InterestRate"],
-            x["ImpliedVolatility"],
-        ),
-        axis=1,
+    df.loc[ix["contract"][contract], "Vega"] = bsm.vega(*contract_df)
+    # Theta
+    df.loc[ix["put"][contract], "Theta"] = bsm.theta_put(*put)
+    df.loc[ix["call"][contract], "Theta"] = bsm.theta_call(*call_)
+
+
+def _bsm_args(df: pd.DataFrame) -> tuple[np.ndarray, ...]:
+    """bsmの関数に渡す引数（s, k, t, r, sigma）を配列で返す"""
+    return tuple(
+        df.loc[:, column].to_numpy(dtype=float)
+        for column in (
+            "UnderlyingPrice",
+            "StrikePrice",
+            "TimeToMaturity",
+            "InterestRate",
+            "ImpliedVolatility",
+        )
     )
 
 
@@ -0,0 +1,205 @@
+"""キャッシュ（sqlite3のデータベース）の保守"""
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from . import database
+from .client import cast_series_dtype
+from .models import IndexOption
+
+# warmで格納できるテーブルと列のデータ型
+WARM_MODELS = {"OPTION_INDEX_OPTION": IndexOption}
+WARM_CHUNKSIZE = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+def get_tables(con: sqlite3.Connection) -> list[str]:
+    sql = (
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )
+    return [row[0] for row in con.execute(sql)]
+
+
+def get_columns(con: sqlite3.Connection, table: str) -> list[str]:
+    return [row[1] for row in con.execute(f'PRAGMA table_info("{table}")')]
+
+
+def _resolve_tables(con: sqlite3.Connection, tables: Optional[list[str]]) -> list[str]:
+    existing = get_tables(con)
+    if not tables:
+        return existing
+    unknown = set(tables) - set(existing)
+    if unknown:
+        raise ValueError(f"Unknown table: {', '.join(sorted(unknown))}")
+    return tables
+
+
+def _table_bytes(con: sqlite3.Connection, table: str) -> Optional[int]:
+    """テーブルとインデックスのサイズ（dbstatが使えない場合はNone）"""
+    sql = (
+        "SELECT SUM(pgsize) FROM dbstat WHERE name = ? "
+        "OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = ?)"
+    )
+    try:
+        return con.execute(sql, (table, table)).fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return None
+
+
+def stats(tables: Optional[list[str]] = None) -> pd.DataFrame:
+    """テーブルごとの行数、日付の範囲、サイズ"""
+    with sqlite3.connect(database.db) as con:
+        rows = []
+        for table in _resolve_tables(con, tables):
+            count = con.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            first = last = None
+            if "Date" in get_columns(con, table):
+                first, last = con.execute(
+                    f'SELECT MIN(Date), MAX(Date) FROM "{table}"'
+                ).fetchone()
+            rows.append(
+                {
+                    "Table": table,
+                    "Rows": count,
+                    "FirstDate": first,
+                    "LastDate": last,
+                    "Bytes": _table_bytes(con, table),
+                }
+            )
+    return pd.DataFrame(
+        rows, columns=["Table", "Rows", "FirstDate", "LastDate", "Bytes"]
+    )
+
+
+def remove_duplicates(tables: Optional[list[str]] = None) -> dict[str, int]:
+    """全列が一致する重複行を削除し、テーブルごとの削除件数を返す"""
+    removed = {}
+    with sqlite3.connect(database.db) as con:
+        for table in _resolve_tables(con, tables):
+            columns = ", ".join(f'"{x}"' for x in get_columns(con, table))
+            cur = con.execute(
+                f'DELETE FROM "{table}" WHERE rowid NOT IN '
+                f'(SELECT MIN(rowid) FROM "{table}" GROUP BY {columns})'
+            )
+            removed[table] = cur.rowcount
+        con.commit()
+    return removed
+
+
+def prune(
+    start_yyyymmdd: str, end_yyyymmdd: str, tables: Optional[list[str]] = None
+) -> dict[str, int]:
+    """期間中（両端を含む）の行を削除し、テーブルごとの削除件数を返す"""
+    start = pd.Timestamp(start_yyyymmdd)
+    end = pd.Timestamp(end_yyyymmdd)
+    removed = {}
+    with sqlite3.connect(database.db) as con:
+        for table in _resolve_tables(con, tables):
+            if "Date" not in get_columns(con, table):
+                continue
+            cur = con.execute(
+                f'DELETE FROM "{table}" WHERE Date BETWEEN ? AND ?',
+                (str(start), str(end)),
+            )
+            removed[table] = cur.rowcount
+        con.commit()
+    return removed
+
+
+def rebuild_indexes(tables: Optional[list[str]] = None) -> None:
+    """Date列のインデックスを作成し、すべてのインデックスを再構築"""
+    with sqlite3.connect(database.db) as con:
+        for table in _resolve_tables(con, tables):
+            if "Date" in get_columns(con, table):
+                con.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_Date" ON "{table}" (Date)'
+                )
+            con.execute(f'REINDEX "{table}"')
+        con.commit()
+
+
+def vacuum() -> None:
+    """VACUUMで空き領域を解放し、ANALYZEで統計情報を更新"""
+    con = sqlite3.connect(database.db)
+    try:
+        con.execute("VACUUM")
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+
+
+def warm(
+    directory: Union[str, Path],
+    start_yyyymmdd: str,
+    end_yyyymmdd: str,
+    table: str = "OPTION_INDEX_OPTION",
+    chunksize: int = WARM_CHUNKSIZE,
+) -> list[pd.Timestamp]:
+    """ローカルのCSVファイルから期間中のデータをキャッシュに格納
+
+    CSVファイルの列は `get_option_index_option` が返すDataFrameと同じとする。
+    ファイル名に日付（YYYYMMDD）が1つだけ含まれる場合は期間外のファイルを読まず、
+    それ以外のファイルは `chunksize` 行ずつ読んで期間中の行だけを格納する。
+    キャッシュ済みの日付は格納せず、格納した日付を返す。
+    """
+    if table not in WARM_MODELS:
+        raise ValueError(f"Unsupported table: {table}")
+    model = WARM_MODELS[table]
+    start = pd.Timestamp(start_yyyymmdd)
+    end = pd.Timestamp(end_yyyymmdd)
+    with sqlite3.connect(database.db) as con:
+        if table in get_tables(con):
+            cached = set(
+                pd.to_datetime(
+                    [
+                        row[0]
+                        for row in con.execute(f'SELECT DISTINCT Date FROM "{table}"')
+                    ]
+                )
+            )
+        else:
+            cached = set()
+    files = sorted(Path(directory).glob("*.csv")) + sorted(
+        Path(directory).glob("*.csv.gz")
+    )
+    stored = set()
+    for f in files:
+        file_date = _file_date(f)
+        if file_date is not None and not start <= file_date <= end:
+            logger.info("Skipped %s: %s is out of range", f, file_date.date())
+            continue
+        stored_file = set()
+        for chunk in pd.read_csv(f, dtype=str, chunksize=chunksize):
+            date = pd.to_datetime(chunk.loc[:, "Date"])
+            chunk = chunk.loc[date.between(start, end) & ~date.isin(cached)]
+            if len(chunk) == 0:
+                continue
+            df = pd.DataFrame(
+                {
+                    col: cast_series_dtype(chunk.loc[:, col], model.get_dtype(col))
+                    for col in chunk.columns
+                }
+            )
+            database.store(df, table)
+            stored_file.update(df.loc[:, "Date"])
+        # 同じ日付を含む別のファイルは格納しない
+        cached |= stored_file
+        stored |= stored_file
+    return sorted(stored)
+
+
+def _file_date(path: Path) -> Optional[pd.Timestamp]:
+    """ファイル名に含まれる日付（YYYYMMDD）
+
+    日付が含まれない場合や、期間のように複数含まれる場合はNoneを返す。
+    """
+    dates = pd.to_datetime(
+        re.findall(r"(?<!\d)\d{8}(?!\d)", path.name), format="%Y%m%d", errors="coerce"
+    ).dropna()
+    return dates[0] if len(dates) == 1 else None
@@ -60,4 +60,16 @@ class IndexOptionAppend(IndexOption):
     Delta: float
     Gamma: float
     Vega: float
-    Theta: float
\ No newline at end of file
+    Theta: float
+
+
+@dataclass
+class IndexOptionSummary(DataFrameColumnsBase):
+    Date: np.dtype("datetime64[ns]")
+    ContractMonth: str
+    UnderlyingPrice: float
+    BaseVolatility: float
+    TimeToMaturity: float
+    AtmImpliedVolatility: float
+    RiskReversal25: float
+    Butterfly25: float
@@ -0,0 +1,155 @@
+"""処理済みデータのNumPyスナップショット
+
+数値列を1つのFortran順の行列（列ごとに連続）として `numeric.npy` に、
+文字列の列をコードの行列として `codes.npy` に保存し、
+列名とコードの対応表を `metadata.json` に保存する。
+読み込み時はメモリマップ（読み取り専用）で開くため、
+複数のプロセスで同じスナップショットをコピーせずに共有できる。
+
+ファイルは書き出すたびに `versions` ディレクトリの下の新しいバージョンに保存し、
+`CURRENT` ファイルを置き換えて切り替える。既存のファイルは上書きしないため、
+メモリマップで開いているプロセスに影響しない。
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import database
+
+SNAPSHOT_VERSION = 1
+NUMERIC_FILE = "numeric.npy"
+CODES_FILE = "codes.npy"
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+def export_snapshot(
+    directory: Union[str, Path],
+    start_yyyymmdd: Optional[str] = None,
+    end_yyyymmdd: Optional[str] = None,
+    table_name: str = "OPTION_INDEX_OPTION_PROCESSED",
+) -> Path:
+    """データベースのテーブルをスナップショットとして書き出す"""
+    if start_yyyymmdd is None and end_yyyymmdd is None:
+        df = database.load_all(table_name)
+    else:
+        df = database.load_range(
+            table_name,
+            start_yyyymmdd or str(pd.Timestamp.min),
+            end_yyyymmdd or str(pd.Timestamp.max),
+        )
+    return write_snapshot(df, directory, table_name)
+
+
+def write_snapshot(
+    df: pd.DataFrame, directory: Union[str, Path], table_name: str = ""
+) -> Path:
+    """DataFrameをスナップショットとして書き出す
+
+    直前のバージョンは読み込み中のプロセスのために残し、それより古いものは削除する。
+    スナップショットではない空でないディレクトリには書き出さない。
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if _current_version(directory) is None and any(directory.iterdir()):
+        raise ValueError(f"Not a snapshot directory: {directory}")
+    versions_dir = directory / VERSIONS_DIR
+    versions_dir.mkdir(exist_ok=True)
+    version_dir = Path(tempfile.mkdtemp(prefix=f"{time.time_ns()}-", dir=versions_dir))
+    numeric_columns = [
+        col for col in df.columns if pd.api.types.is_numeric_dtype(df.loc[:, col])
+    ]
+    code_columns = [col for col in df.columns if col not in numeric_columns]
+    numeric = np.asfortranarray(
+        df.loc[:, numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    )
+    codes = np.empty((len(df), len(code_columns)), dtype=np.int32, order="F")
+    categories = {}
+    for i, col in enumerate(code_columns):
+        codes[:, i], uniques = pd.factorize(df.loc[:, col].astype("object"))
+        categories[col] = [str(x) for x in uniques]
+    np.save(version_dir / NUMERIC_FILE, numeric)
+    np.save(version_dir / CODES_FILE, codes)
+    metadata = {
+        "version": SNAPSHOT_VERSION,
+        "table_name": table_name,
+        "rows": len(df),
+        "columns": list(df.columns),
+        "numeric_columns": numeric_columns,
+        "code_columns": code_columns,
+        "categories": categories,
+    }
+    (version_dir / METADATA_FILE).write_text(
+        json.dumps(metadata, ensure_ascii=False), encoding="utf-8"
+    )
+    previous = _current_version(directory)
+    _replace_current(directory, version_dir.name)
+    for path in versions_dir.iterdir():
+        if path.is_dir() and path.name not in (version_dir.name, previous):
+            shutil.rmtree(path, ignore_errors=True)
+    return directory
+
+
+def _current_version(directory: Path) -> Optional[str]:
+    try:
+        return (directory / CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def _replace_current(directory: Path, version: str) -> None:
+    """CURRENTファイルをアトミックに置き換える"""
+    fd, tmp = tempfile.mkstemp(prefix=f".{CURRENT_FILE}-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp, directory / CURRENT_FILE)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def open_snapshot(
+    directory: Union[str, Path],
+) -> tuple[np.ndarray, np.ndarray, dict]:
+    """スナップショットの数値行列、コード行列、メタデータをメモリマップで開く"""
+    directory = Path(directory)
+    version = _current_version(directory)
+    if version is None:
+        raise FileNotFoundError(f"No snapshot in {directory}")
+    version_dir = directory / VERSIONS_DIR / version
+    metadata = json.loads((version_dir / METADATA_FILE).read_text(encoding="utf-8"))
+    if metadata["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {metadata['version']}")
+    numeric = np.load(version_dir / NUMERIC_FILE, mmap_mode="r")
+    codes = np.load(version_dir / CODES_FILE, mmap_mode="r")
+    if not numeric.shape[0] == codes.shape[0] == metadata["rows"]:
+        raise ValueError(
+            f"Inconsistent snapshot in {version_dir}: numeric={numeric.shape[0]}, "
+            f"codes={codes.shape[0]}, metadata={metadata['rows']} rows"
+        )
+    return numeric, codes, metadata
+
+
+def load_snapshot(directory: Union[str, Path]) -> pd.DataFrame:
+    """スナップショットをDataFrameとして読み込む
+
+    数値列はメモリマップをコピーせずに参照する（読み取り専用）。
+    文字列の列はカテゴリ型で数値列の後ろに並ぶ。
+    """
+    numeric, codes, metadata = open_snapshot(directory)
+    df = pd.DataFrame(numeric, columns=metadata["numeric_columns"], copy=False)
+    for i, col in enumerate(metadata["code_columns"]):
+        df[col] = pd.Categorical.from_codes(
+            codes[:, i], categories=metadata["categories"][col]
+        )
+    return df
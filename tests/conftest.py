@@ -1,3 +1,5 @@
+import shutil
+import sqlite3
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
@@ -21,3 +23,15 @@ def cli():
             )
 
     return Client()
+
+
+@pytest.fixture()
+def tmp_db(tmp_path):
+    """テスト用データベースのコピー（処理済みデータと要約のテーブルを除く）"""
+    db = tmp_path / "jquantsapi.db"
+    shutil.copy(Path(__file__).resolve().parent / "jquantsapi.db", db)
+    with sqlite3.connect(db) as con:
+        con.execute("DROP TABLE IF EXISTS OPTION_INDEX_OPTION_PROCESSED")
+        con.execute("DROP TABLE IF EXISTS OPTION_INDEX_OPTION_SUMMARY")
+    jquants_derivatives.database.db = db
+    return db
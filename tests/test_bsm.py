@@ -1,4 +1,6 @@
 import numpy as np
+import pytest
+from scipy.stats import norm
 
 from jquants_derivatives import Option, bsm, client, models
 
@@ -36,3 +38,64 @@ def test_bsm(cli):
     np.testing.assert_array_almost_equal(
         bsm.price_call(s, k_call, t, r, sigma_call), price_call.values, decimal=1
     )
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_bsm_kernels(monkeypatch, use_numba):
+    if use_numba and not bsm._bsm_numba:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(bsm, "USE_NUMBA", use_numba)
+    s, t, r = 27500.0, 0.05, 0.0005
+    k = np.linspace(24000.0, 31000.0, 15)
+    sigma = np.linspace(0.3, 0.18, 15)
+    d1 = ((np.log(s / k)) + (r + sigma**2 * 0.5 * t)) / (sigma * np.sqrt(t))
+    d2 = d1 - sigma * np.sqrt(t)
+    expected_put = k * np.exp(-r * t) * norm.cdf(-d2) - s * norm.cdf(-d1)
+    expected_call = s * norm.cdf(d1) - k * np.exp(-r * t) * norm.cdf(d2)
+    np.testing.assert_allclose(bsm.price_put(s, k, t, r, sigma), expected_put)
+    np.testing.assert_allclose(bsm.price_call(s, k, t, r, sigma), expected_call)
+    np.testing.assert_allclose(bsm.delta_call(s, k, t, r, sigma), norm.cdf(d1))
+    np.testing.assert_allclose(bsm.delta_put(s, k, t, r, sigma), norm.cdf(d1) - 1)
+    np.testing.assert_allclose(
+        bsm.gamma(s, k, t, r, sigma), norm.pdf(d1) / (s * sigma * np.sqrt(t))
+    )
+    np.testing.assert_allclose(
+        bsm.vega(s, k, t, r, sigma), s * norm.pdf(d1) * np.sqrt(t)
+    )
+    implied_volatility_put = np.vectorize(bsm.implied_volatility_put)
+    implied_volatility_call = np.vectorize(bsm.implied_volatility_call)
+    np.testing.assert_allclose(
+        implied_volatility_put(s, k, t, r, expected_put), sigma, rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        implied_volatility_call(s, k, t, r, expected_call), sigma, rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        # 配列を渡すと配列を返す
+        (
+            (27500.0, np.array([26000.0, 29000.0]), 0.05, 0.0005, [50.0, 1600.0], 1),
+            [0.190544, 0.221012],
+        ),
+        # divは浮動小数点数でもよい
+        ((27500.0, 27000.0, 0.05, 0.0005, 200.0, 1.0), 0.165268),
+        # 本質的価値を下回るプレミアム
+        ((27500.0, 29000.0, 0.05, 0.0005, 1000.0, 1), np.nan),
+        # nanを含む入力
+        ((27500.0, 26000.0, 0.05, 0.0005, np.nan, 1), np.nan),
+        ((np.nan, 26000.0, 0.05, 0.0005, 50.0, 1), np.nan),
+        # ATMかつ金利0（初期値が0になる）
+        ((27500.0, 27500.0, 0.05, 0.0, 400.0, 2), 0.163063),
+    ],
+)
+def test_implied_volatility_edge_cases(monkeypatch, use_numba, args, expected):
+    if use_numba and not bsm._bsm_numba:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(bsm, "USE_NUMBA", use_numba)
+    result = bsm.implied_volatility(*args)
+    assert np.shape(result) == np.shape(expected)
+    np.testing.assert_allclose(result, expected, rtol=1e-5)
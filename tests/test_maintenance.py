@@ -0,0 +1,79 @@
+import sqlite3
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import jquants_derivatives
+from jquants_derivatives import maintenance
+
+
+def count(table):
+    with sqlite3.connect(jquants_derivatives.database.db) as con:
+        return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_maintenance(tmp_path, tmp_db):
+    raw = jquants_derivatives.database.load("OPTION_INDEX_OPTION", "2023-01-04")
+    raw.to_csv(tmp_path / "20230104.csv", index=False)
+    rows = len(raw)
+
+    jquants_derivatives.database.store(raw.iloc[:10], "OPTION_INDEX_OPTION")
+    assert maintenance.remove_duplicates(["OPTION_INDEX_OPTION"]) == {
+        "OPTION_INDEX_OPTION": 10
+    }
+    assert count("OPTION_INDEX_OPTION") == rows
+
+    stats = maintenance.stats().set_index("Table")
+    assert stats.loc["OPTION_INDEX_OPTION", "Rows"] == rows
+    assert stats.loc["OPTION_INDEX_OPTION", "FirstDate"] == "2023-01-04 00:00:00"
+
+    removed = maintenance.prune("2023-01-01", "2023-01-31")
+    assert removed["OPTION_INDEX_OPTION"] == rows
+    assert count("OPTION_INDEX_OPTION") == 0
+
+    # ファイル名の日付が期間外のファイルは読まない
+    (tmp_path / "20220104.csv").write_text("not a csv")
+    dates = maintenance.warm(tmp_path, "2023-01-01", "2023-01-31", chunksize=1000)
+    assert dates == [pd.Timestamp("2023-01-04")]
+    assert count("OPTION_INDEX_OPTION") == rows
+    assert maintenance.warm(tmp_path, "2023-01-01", "2023-01-31") == []
+
+    maintenance.rebuild_indexes(["OPTION_INDEX_OPTION"])
+    maintenance.vacuum()
+    with sqlite3.connect(tmp_db) as con:
+        indexes = con.execute("PRAGMA index_list(OPTION_INDEX_OPTION)").fetchall()
+    assert [x[1] for x in indexes] == ["idx_OPTION_INDEX_OPTION_Date"]
+    warmed = jquants_derivatives.database.load("OPTION_INDEX_OPTION", "2023-01-04")
+    assert len(warmed) == rows
+    assert (warmed.loc[:, "StrikePrice"] == raw.loc[:, "StrikePrice"]).all()
+
+
+def test_warm_file_names(tmp_path, tmp_db, caplog):
+    raw = jquants_derivatives.database.load("OPTION_INDEX_OPTION", "2023-01-04")
+    maintenance.prune("2023-01-01", "2023-01-31")
+    # 期間を表す複数の日付を含むファイルは内容の日付で絞り込む
+    raw.to_csv(tmp_path / "option_20230101_20230131.csv", index=False)
+    (tmp_path / "option_20220104.csv").write_text("not a csv")
+    with caplog.at_level("INFO", logger=maintenance.__name__):
+        dates = maintenance.warm(tmp_path, "2023-01-01", "2023-01-31")
+    assert dates == [pd.Timestamp("2023-01-04")]
+    assert count("OPTION_INDEX_OPTION") == len(raw)
+    assert "option_20220104.csv" in caplog.text
+    assert "option_20230101_20230131.csv" not in caplog.text
+
+
+def test_warm_unsupported_table(tmp_path, tmp_db):
+    with pytest.raises(ValueError):
+        maintenance.warm(tmp_path, "2023-01-01", "2023-01-31", table="INDICES_TOPIX")
+
+
+def test_main_offline(tmp_path, monkeypatch):
+    def urlopen(*args, **kwargs):
+        raise urllib.error.URLError("offline")
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(jquants_derivatives.database, "directory", tmp_path)
+    monkeypatch.setattr(jquants_derivatives.database, "db", tmp_path / "test.db")
+    with pytest.warns(UserWarning):
+        jquants_derivatives.database.main()
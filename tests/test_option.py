@@ -0,0 +1,42 @@
+import pandas as pd
+
+import jquants_derivatives
+
+
+def test_align_itm_from_otm(cli, tmp_db):
+    df = cli.get_option_index_option()
+    contract = sorted(df.loc[:, "ContractMonth"].unique())[0]
+    s = df.loc[:, "UnderlyingPrice"].iloc[0]
+    call_ = df.loc[
+        (df.loc[:, "ContractMonth"] == contract)
+        & (df.loc[:, "PutCallDivision"] == 2)
+        & (df.loc[:, "StrikePrice"] > s)
+    ]
+    missing_strike = call_.loc[:, "StrikePrice"].sort_values().iloc[1]
+    # ストライクが片側にしか存在しない場合
+    irregular = df.drop(call_.loc[call_.loc[:, "StrikePrice"] == missing_strike].index)
+    option = jquants_derivatives.Option(irregular, contracts=2, use_cache=False)
+    data = option.df.set_index(["ContractMonth", "PutCallDivision", "StrikePrice"])
+    unmatched = option.unmatched_strikes
+    assert (
+        (unmatched.loc[:, "StrikePrice"] == missing_strike)
+        & (unmatched.loc[:, "ContractMonth"] == contract)
+        & (unmatched.loc[:, "PutCallDivision"] == 1)
+    ).any()
+    # 欠けたストライク以外は同じストライクのOTMにそろえる
+    strike = call_.loc[:, "StrikePrice"].sort_values().iloc[2]
+    assert (
+        data.loc[(contract, 1, strike), "ImpliedVolatility"]
+        == data.loc[(contract, 2, strike), "ImpliedVolatility"]
+    )
+    # 対応するOTMがないITMは元の値のまま
+    raw_iv = irregular.loc[
+        (irregular.loc[:, "ContractMonth"] == contract)
+        & (irregular.loc[:, "PutCallDivision"] == 1)
+        & (irregular.loc[:, "StrikePrice"] == missing_strike),
+        "ImpliedVolatility",
+    ].iloc[0]
+    assert data.loc[(contract, 1, missing_strike), "ImpliedVolatility"] == raw_iv * 0.01
+    # キャッシュから読み込んだ場合も対応しないストライクを返す
+    cached = jquants_derivatives.Option(irregular, contracts=2)
+    pd.testing.assert_frame_equal(cached.unmatched_strikes, unmatched)
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+import jquants_derivatives
+from jquants_derivatives import snapshot
+
+
+def test_snapshot(cli, tmp_path, tmp_db):
+    jquants_derivatives.Option(cli.get_option_index_option(), contracts=2)
+    processed = jquants_derivatives.database.load(
+        "OPTION_INDEX_OPTION_PROCESSED", "2023-01-04"
+    )
+    snapshot.export_snapshot(tmp_path / "snapshot", "2023-01-01", "2023-01-31")
+    df = snapshot.load_snapshot(tmp_path / "snapshot")
+    numeric, _, metadata = snapshot.open_snapshot(tmp_path / "snapshot")
+    assert sorted(df.columns) == sorted(processed.columns)
+    assert len(df) == len(processed)
+    assert isinstance(numeric, np.memmap)
+    assert not df.loc[:, "StrikePrice"].to_numpy().flags.writeable
+    for col in metadata["numeric_columns"]:
+        np.testing.assert_array_equal(
+            df.loc[:, col].to_numpy(), processed.loc[:, col].to_numpy(dtype=float)
+        )
+    for col in ("Date", "Code", "ContractMonth"):
+        assert list(df.loc[:, col].astype(str)) == list(processed.loc[:, col])
+
+
+def test_snapshot_rewrite(cli, tmp_path, tmp_db):
+    jquants_derivatives.Option(cli.get_option_index_option(), contracts=2)
+    processed = jquants_derivatives.database.load(
+        "OPTION_INDEX_OPTION_PROCESSED", "2023-01-04"
+    )
+    directory = tmp_path / "snapshot"
+    snapshot.write_snapshot(processed, directory)
+    df = snapshot.load_snapshot(directory)
+    strike_sum = processed.loc[:, "StrikePrice"].sum()
+    # 開いているスナップショットのファイルは上書きしない
+    for _ in range(3):
+        snapshot.write_snapshot(processed.iloc[:10], directory)
+        assert df.loc[:, "StrikePrice"].sum() == strike_sum
+    assert len(snapshot.load_snapshot(directory)) == 10
+    assert len(list((directory / snapshot.VERSIONS_DIR).iterdir())) == 2
+
+
+def test_snapshot_keeps_other_directories(cli, tmp_path, tmp_db):
+    df = cli.get_option_index_option().iloc[:10]
+    directory = tmp_path / "snapshot"
+    snapshot.write_snapshot(df, directory)
+    (directory / "other").mkdir()
+    (directory / "other" / "data.txt").write_text("data")
+    for _ in range(3):
+        snapshot.write_snapshot(df, directory)
+    assert (directory / "other" / "data.txt").read_text() == "data"
+
+
+def test_snapshot_refuses_non_snapshot_directory(cli, tmp_path, tmp_db):
+    directory = tmp_path / "data"
+    directory.mkdir()
+    (directory / "data.txt").write_text("data")
+    with pytest.raises(ValueError):
+        snapshot.write_snapshot(cli.get_option_index_option().iloc[:10], directory)
+    assert [x.name for x in directory.iterdir()] == ["data.txt"]
+
+
+def test_snapshot_inconsistent(cli, tmp_path, tmp_db):
+    directory = tmp_path / "snapshot"
+    snapshot.write_snapshot(cli.get_option_index_option().iloc[:10], directory)
+    version = (directory / snapshot.CURRENT_FILE).read_text()
+    version_dir = directory / snapshot.VERSIONS_DIR / version
+    metadata_path = version_dir / snapshot.METADATA_FILE
+    metadata = json.loads(metadata_path.read_text())
+    metadata["rows"] = 20
+    metadata_path.write_text(json.dumps(metadata))
+    with pytest.raises(ValueError):
+        snapshot.open_snapshot(directory)
@@ -0,0 +1,76 @@
+import numpy as np
+
+import jquants_derivatives
+
+
+def test_summary(cli, tmp_db):
+    df = cli.get_option_index_option()
+    option = jquants_derivatives.Option(df, contracts=2)
+    summary = jquants_derivatives.load_summary("2023-01-01", "2023-01-31")
+    assert list(summary.loc[:, "ContractMonth"]) == option.contract_month
+    assert (summary.loc[:, "Date"] == option.date).all()
+    front = summary.iloc[0]
+    assert front["UnderlyingPrice"] == option.underlying_price[front["ContractMonth"]]
+    assert 0 < front["AtmImpliedVolatility"] < 1
+    assert np.isfinite(front["RiskReversal25"])
+    assert np.isfinite(front["Butterfly25"])
+    # 既に保管されている限月は追加しない
+    jquants_derivatives.Option(df, contracts=2)
+    assert len(jquants_derivatives.load_summary("2023-01-04", "2023-01-04")) == 2
+    assert len(jquants_derivatives.load_summary("2023-02-01", "2023-02-28")) == 0
+
+
+def test_summary_skips_stored_contracts(cli, monkeypatch, tmp_db):
+    df = cli.get_option_index_option()
+    jquants_derivatives.Option(df, contracts=1)
+
+    computed = []
+    get_summary = jquants_derivatives.Option.get_summary
+
+    def spy(self, contract_month=None):
+        computed.append(contract_month)
+        return get_summary(self, contract_month)
+
+    monkeypatch.setattr(jquants_derivatives.Option, "get_summary", spy)
+    option = jquants_derivatives.Option(df, contracts=2, use_cache=False)
+    assert computed == [option.contract_month[1:]]
+    jquants_derivatives.Option(df, contracts=2, use_cache=False)
+    assert len(computed) == 1
+
+
+def test_summary_ignores_min_price(cli, tmp_db):
+    df = cli.get_option_index_option()
+    option = jquants_derivatives.Option(df, contracts=2, min_price=50, use_cache=False)
+    expected = jquants_derivatives.Option(
+        df, contracts=2, use_cache=False
+    ).get_summary()
+    summary = jquants_derivatives.load_summary("2023-01-04", "2023-01-04")
+    assert len(summary) == 2
+    np.testing.assert_allclose(
+        summary.loc[:, "AtmImpliedVolatility"],
+        expected.loc[:, "AtmImpliedVolatility"],
+    )
+    np.testing.assert_allclose(
+        summary.loc[:, "Butterfly25"], expected.loc[:, "Butterfly25"]
+    )
+    # インスタンスの抽出条件は変わらない
+    assert len(option.contracts_dfs[option.contract_month[0]]) < len(
+        jquants_derivatives.Option(df, contracts=2, use_cache=False).contracts_dfs[
+            option.contract_month[0]
+        ]
+    )
+
+
+def test_update_summary_table_name(cli, tmp_db):
+    df = cli.get_option_index_option()
+
+    class Client:
+        def get_option_index_option(self, date_yyyymmdd):
+            return df
+
+    jquants_derivatives.update_summary(Client(), ["2023-01-04"], table_name="SUMMARY")
+    assert len(jquants_derivatives.load_summary("2023-01-04", "2023-01-04")) == 0
+    summary = jquants_derivatives.load_summary(
+        "2023-01-04", "2023-01-04", table_name="SUMMARY"
+    )
+    assert len(summary) == 2